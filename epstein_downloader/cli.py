@@ -1,22 +1,131 @@
 """Command-line interface for the Epstein Files Downloader."""
 
+import argparse
+import collections
+import itertools
+import os
 import sys
 from pathlib import Path
 
-import click
-from rich.console import Console
-from rich.table import Table
-
 from . import __version__
-from .config import DATASETS, get_zip_url
-from .downloader import Downloader, check_aria2c, get_aria2c_install_instructions, diagnose_torrent_connectivity
-from .scraper import DatasetScraper
 
-console = Console()
+# Heavy modules (rich, requests, the downloader and scraper) are imported
+# inside the commands that need them so `--help` and friends start fast.
+_console = None
+
+
+def get_console():
+    """Return the shared Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+def _iter_files(path):
+    """Yield a DirEntry for every regular file under path, recursively."""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_symlink():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                try:
+                    yield from _iter_files(entry.path)
+                except PermissionError:
+                    # Skip unreadable subtrees, as Path.rglob() did
+                    continue
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+# Directory scans are sized in batches; once a scan outgrows one batch the
+# stat() calls are spread over a thread pool to overlap per-file latency,
+# which dominates on network and FUSE filesystems.
+_STAT_BATCH = 1024
+_STAT_WORKERS = 16
+
+
+def _batch_size(entries):
+    """Return the combined size of a list of DirEntry objects."""
+    return sum(entry.stat(follow_symlinks=False).st_size for entry in entries)
+
+
+def _sum_sizes(entries):
+    """Return (count, total_size) for an iterable of DirEntry objects."""
+    entries = iter(entries)
+    batches = iter(lambda: list(itertools.islice(entries, _STAT_BATCH)), [])
+    first = next(batches, [])
+    count, total_size = len(first), _batch_size(first)
+
+    # Small scans are not worth a pool, and on Windows the size already
+    # came with the directory listing
+    if len(first) < _STAT_BATCH or os.name == "nt":
+        for batch in batches:
+            count += len(batch)
+            total_size += _batch_size(batch)
+        return count, total_size
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=_STAT_WORKERS) as pool:
+        pending = collections.deque()
+        for batch in batches:
+            count += len(batch)
+            pending.append(pool.submit(_batch_size, batch))
+            # Bound the number of batches held in memory at once
+            if len(pending) >= 2 * _STAT_WORKERS:
+                total_size += pending.popleft().result()
+        total_size += sum(future.result() for future in pending)
+    return count, total_size
+
+
+def _count_files(path, suffix):
+    """Return (count, total_size) of the files in path ending with suffix."""
+    with os.scandir(path) as it:
+        return _sum_sizes(
+            entry for entry in it
+            if entry.name.endswith(suffix) and entry.is_file(follow_symlinks=False)
+        )
+
+
+def _load_json(path):
+    """Load a JSON file, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        import json
+        with open(path, "rb") as f:
+            return json.load(f)
+    return orjson.loads(path.read_bytes())
+
+
+def _load_index_stats(index_file, stats_file):
+    """Return (file_count, last_page, complete) for a scrape index.
+
+    Reads the small stats sidecar written by the scraper when it is at
+    least as new as the index, otherwise parses the full index.
+    """
+    try:
+        if stats_file.stat().st_mtime >= index_file.stat().st_mtime:
+            stats = _load_json(stats_file)
+            return stats["file_count"], stats["last_page"], stats["complete"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    index = _load_json(index_file)
+    return (
+        len(index.get("files", {})),
+        index.get("last_page", 0),
+        index.get("complete", False),
+    )
 
 
 def print_banner():
-    """Print the application banner."""
+    """Print the application banner (skipped when output is not a terminal)."""
+    console = get_console()
+    if not console.is_terminal:
+        return
     console.print("""
 [bold cyan]================================================================
          EPSTEIN FILES DOWNLOADER v{version}                     
@@ -26,16 +135,13 @@ def print_banner():
 """.format(version=__version__))
 
 
-@click.group()
-@click.version_option(version=__version__)
-def main():
-    """Epstein Files Downloader - Archive DOJ Epstein documents."""
-    pass
+def list_datasets():
+    """List all available datasets and their status."""
+    from rich.table import Table
 
+    from .config import DATASETS
 
-@main.command()
-def list():
-    """List all available datasets and their status."""
+    console = get_console()
     print_banner()
 
     table = Table(title="Available Datasets")
@@ -72,19 +178,13 @@ def list():
     console.print("[dim]Use torrents or PDF scraping to download these.[/dim]")
 
 
-@main.command()
-@click.option("--output", "-o", default=".", help="Output directory")
-@click.option("--all", "download_all", is_flag=True, help="Download everything")
-@click.option("--torrents", is_flag=True, help="Download available torrents")
-@click.option("--zips", is_flag=True, help="Download available ZIPs")
-@click.option("--scrape-dataset9", is_flag=True, help="Scrape and download Dataset 9 PDFs")
-@click.option("--scrape-dataset11", is_flag=True, help="Scrape and download Dataset 11 PDFs")
-@click.option("--start-page", default=0, help="Start page for scraping")
-@click.option("--max-pages", default=None, type=int, help="Max pages to scrape")
-@click.option("--concurrent", "-c", default=5, help="Concurrent downloads for PDFs")
 def download(output, download_all, torrents, zips, scrape_dataset9, scrape_dataset11, 
-             start_page, max_pages, concurrent):
+             start_page, max_pages, concurrent, no_falloc):
     """Download datasets."""
+    from .downloader import Downloader, check_aria2c, get_aria2c_install_instructions
+    from .scraper import DatasetScraper
+
+    console = get_console()
     print_banner()
 
     if not check_aria2c():
@@ -95,7 +195,7 @@ def download(output, download_all, torrents, zips, scrape_dataset9, scrape_datas
     output_dir = Path(output).resolve()
     console.print(f"[bold]Output directory:[/bold] {output_dir}\n")
 
-    downloader = Downloader(output_dir, concurrent=concurrent)
+    downloader = Downloader(output_dir, concurrent=concurrent, falloc=not no_falloc)
 
     if download_all or torrents:
         console.print("\n[bold cyan]=== TORRENTS ===[/bold cyan]")
@@ -131,10 +231,11 @@ def download(output, download_all, torrents, zips, scrape_dataset9, scrape_datas
         console.print("  epstein-dl download --zips       # Just ZIP files")
 
 
-@main.command()
-@click.option("--output", "-o", default=".", help="Output directory to check")
 def status(output):
     """Check download status."""
+    from rich.table import Table
+
+    console = get_console()
     print_banner()
 
     output_dir = Path(output).resolve()
@@ -147,9 +248,7 @@ def status(output):
     # Check torrents directory
     torrents_dir = output_dir / "torrents"
     if torrents_dir.exists():
-        files = list(torrents_dir.rglob("*"))
-        file_count = len([f for f in files if f.is_file()])
-        total_size = sum(f.stat().st_size for f in files if f.is_file())
+        file_count, total_size = _sum_sizes(_iter_files(torrents_dir))
         table.add_row("torrents/", str(file_count), f"{total_size / (1024**3):.2f} GB")
     else:
         table.add_row("torrents/", "0", "0 GB")
@@ -157,9 +256,7 @@ def status(output):
     # Check zips directory
     zips_dir = output_dir / "zips"
     if zips_dir.exists():
-        files = list(zips_dir.glob("*.zip"))
-        file_count = len(files)
-        total_size = sum(f.stat().st_size for f in files)
+        file_count, total_size = _count_files(zips_dir, ".zip")
         table.add_row("zips/", str(file_count), f"{total_size / (1024**3):.2f} GB")
     else:
         table.add_row("zips/", "0", "0 GB")
@@ -168,9 +265,7 @@ def status(output):
     for ds_num in [9, 11]:
         pdf_dir = output_dir / f"dataset{ds_num}-pdfs"
         if pdf_dir.exists():
-            files = list(pdf_dir.glob("*.pdf"))
-            file_count = len(files)
-            total_size = sum(f.stat().st_size for f in files)
+            file_count, total_size = _count_files(pdf_dir, ".pdf")
             table.add_row(f"dataset{ds_num}-pdfs/", str(file_count), f"{total_size / (1024**3):.2f} GB")
         else:
             table.add_row(f"dataset{ds_num}-pdfs/", "0", "0 GB")
@@ -181,24 +276,21 @@ def status(output):
     console.print("\n[bold]Scrape Progress:[/bold]")
     for ds_num in [9, 11]:
         index_file = output_dir / f"dataset{ds_num}-index.json"
+        stats_file = output_dir / f"dataset{ds_num}-index.stats.json"
         if index_file.exists():
-            import json
-            with open(index_file) as f:
-                index = json.load(f)
-            file_count = len(index.get("files", {}))
-            last_page = index.get("last_page", 0)
-            complete = index.get("complete", False)
+            file_count, last_page, complete = _load_index_stats(index_file, stats_file)
             status_str = "[green]complete[/green]" if complete else f"page {last_page}"
             console.print(f"  Dataset {ds_num}: {file_count} files indexed ({status_str})")
         else:
             console.print(f"  Dataset {ds_num}: [dim]not started[/dim]")
 
 
-@main.command()
-@click.option("--output", "-o", default=".", help="Output directory")
-@click.argument("dataset", type=int)
 def resume(output, dataset):
     """Resume downloading missing files for a dataset."""
+    from .downloader import Downloader, check_aria2c, get_aria2c_install_instructions
+    from .scraper import DatasetScraper
+
+    console = get_console()
     print_banner()
 
     if not check_aria2c():
@@ -220,12 +312,69 @@ def resume(output, dataset):
     downloader.download_pdf_list(missing, pdf_dir)
 
 
-@main.command()
 def diagnose():
     """Diagnose torrent connectivity issues."""
+    from .downloader import diagnose_torrent_connectivity
+
     print_banner()
     diagnose_torrent_connectivity()
 
 
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="epstein-dl",
+        description="Epstein Files Downloader - Archive DOJ Epstein documents.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s, version {__version__}")
+    subparsers = parser.add_subparsers(dest="cmd", metavar="COMMAND")
+
+    subparsers.add_parser("list", help="List all available datasets and their status.")
+
+    p = subparsers.add_parser("download", help="Download datasets.")
+    p.add_argument("--output", "-o", default=".", help="Output directory")
+    p.add_argument("--all", dest="download_all", action="store_true", help="Download everything")
+    p.add_argument("--torrents", action="store_true", help="Download available torrents")
+    p.add_argument("--zips", action="store_true", help="Download available ZIPs")
+    p.add_argument("--scrape-dataset9", action="store_true", help="Scrape and download Dataset 9 PDFs")
+    p.add_argument("--scrape-dataset11", action="store_true", help="Scrape and download Dataset 11 PDFs")
+    p.add_argument("--start-page", default=0, type=int, help="Start page for scraping")
+    p.add_argument("--max-pages", default=None, type=int, help="Max pages to scrape")
+    p.add_argument("--concurrent", "-c", default=5, type=int, help="Concurrent downloads for PDFs")
+    p.add_argument("--no-falloc", action="store_true",
+                   help="Don't preallocate ZIPs with fallocate (for exFAT/NTFS-3G/NFS drives)")
+
+    p = subparsers.add_parser("status", help="Check download status.")
+    p.add_argument("--output", "-o", default=".", help="Output directory to check")
+
+    p = subparsers.add_parser("resume", help="Resume downloading missing files for a dataset.")
+    p.add_argument("--output", "-o", default=".", help="Output directory")
+    p.add_argument("dataset", type=int)
+
+    subparsers.add_parser("diagnose", help="Diagnose torrent connectivity issues.")
+
+    return parser
+
+
+COMMANDS = {
+    "list": list_datasets,
+    "download": download,
+    "status": status,
+    "resume": resume,
+    "diagnose": diagnose,
+}
+
+
+def main(argv=None):
+    """Epstein Files Downloader - Archive DOJ Epstein documents."""
+    parser = build_parser()
+    args = vars(parser.parse_args(argv))
+    cmd = args.pop("cmd")
+    if cmd is None:
+        parser.print_help()
+        return
+    COMMANDS[cmd](**args)
+
+
 if __name__ == "__main__":
     main()
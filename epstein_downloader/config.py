@@ -1,5 +1,6 @@
 """Configuration and constants for the Epstein Files Downloader."""
 
+import sys
 from dataclasses import dataclass
 from typing import Optional
 
@@ -25,8 +26,15 @@ TRACKERS = [
     "udp://vibe.community:6969/announce",
 ]
 
+# Tracker query string appended to magnet links
+_TRACKER_PARAMS = "&".join(f"tr={t}" for t in TRACKERS)
 
-@dataclass
+
+# dataclass(slots=True) is only available on Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class DatasetInfo:
     """Information about a dataset."""
     number: int
@@ -40,119 +48,140 @@ class DatasetInfo:
     checksum_md5: Optional[str] = None
 
 
-# Dataset configurations
-DATASETS = {
-    1: DatasetInfo(
-        number=1,
-        zip_available=True,
-        zip_size_mb=1260,
-        magnet=None,
-        magnet_size_gb=None,
-        efta_start=1,
-        efta_end=39024,
-    ),
-    2: DatasetInfo(
-        number=2,
-        zip_available=True,
-        zip_size_mb=631,
-        magnet=None,
-        magnet_size_gb=None,
-        efta_start=None,
-        efta_end=None,
-    ),
-    3: DatasetInfo(
-        number=3,
-        zip_available=True,
-        zip_size_mb=595,
-        magnet=None,
-        magnet_size_gb=None,
-        efta_start=None,
-        efta_end=None,
-    ),
-    4: DatasetInfo(
-        number=4,
-        zip_available=True,
-        zip_size_mb=352,
-        magnet=None,
-        magnet_size_gb=None,
-        efta_start=None,
-        efta_end=None,
-    ),
-    5: DatasetInfo(
-        number=5,
-        zip_available=True,
-        zip_size_mb=61,
-        magnet=None,
-        magnet_size_gb=None,
-        efta_start=None,
-        efta_end=None,
-    ),
-    6: DatasetInfo(
-        number=6,
-        zip_available=True,
-        zip_size_mb=51,
-        magnet=None,
-        magnet_size_gb=None,
-        efta_start=None,
-        efta_end=None,
-    ),
-    7: DatasetInfo(
-        number=7,
-        zip_available=True,
-        zip_size_mb=97,
-        magnet=None,
-        magnet_size_gb=None,
-        efta_start=None,
-        efta_end=None,
-    ),
-    8: DatasetInfo(
-        number=8,
-        zip_available=True,
-        zip_size_mb=10200,
-        magnet=None,
-        magnet_size_gb=None,
-        efta_start=None,
-        efta_end=None,
-    ),
-    9: DatasetInfo(
-        number=9,
-        zip_available=False,  # REMOVED!
-        zip_size_mb=None,
-        magnet="magnet:?xt=urn:btih:0a3d4b84a77bd982c9c2761f40944402b94f9c64",
-        magnet_size_gb=46,  # Partial
-        efta_start=39025,
-        efta_end=1262781,
-    ),
-    10: DatasetInfo(
-        number=10,
-        zip_available=False,  # REMOVED!
-        zip_size_mb=None,
-        magnet="magnet:?xt=urn:btih:d509cc4ca1a415a9ba3b6cb920f67c44aed7fe1f",
-        magnet_size_gb=82,
-        efta_start=1262782,
-        efta_end=2205654,
-        checksum_sha256="7D6935B1C63FF2F6BCABDD024EBC2A770F90C43B0D57B646FA7CBD4C0ABCF846",
-        checksum_md5="B8A72424AE812FD21D225195812B2502",
-    ),
-    11: DatasetInfo(
-        number=11,
-        zip_available=False,  # REMOVED!
-        zip_size_mb=None,
-        magnet=None,  # No verified magnet yet
-        magnet_size_gb=None,
-        efta_start=2205655,
-        efta_end=2730264,
-    ),
-    12: DatasetInfo(
-        number=12,
-        zip_available=True,
-        zip_size_mb=114,
-        magnet="magnet:?xt=urn:btih:8bc781c7259f4b82406cd2175a1d5e9c3b6bfc90",
-        magnet_size_gb=0.114,
-        efta_start=2730265,
-        efta_end=None,
-    ),
-}
+def _build_datasets() -> dict:
+    """Build the dataset configurations."""
+    return {
+        1: DatasetInfo(
+            number=1,
+            zip_available=True,
+            zip_size_mb=1260,
+            magnet=None,
+            magnet_size_gb=None,
+            efta_start=1,
+            efta_end=39024,
+        ),
+        2: DatasetInfo(
+            number=2,
+            zip_available=True,
+            zip_size_mb=631,
+            magnet=None,
+            magnet_size_gb=None,
+            efta_start=None,
+            efta_end=None,
+        ),
+        3: DatasetInfo(
+            number=3,
+            zip_available=True,
+            zip_size_mb=595,
+            magnet=None,
+            magnet_size_gb=None,
+            efta_start=None,
+            efta_end=None,
+        ),
+        4: DatasetInfo(
+            number=4,
+            zip_available=True,
+            zip_size_mb=352,
+            magnet=None,
+            magnet_size_gb=None,
+            efta_start=None,
+            efta_end=None,
+        ),
+        5: DatasetInfo(
+            number=5,
+            zip_available=True,
+            zip_size_mb=61,
+            magnet=None,
+            magnet_size_gb=None,
+            efta_start=None,
+            efta_end=None,
+        ),
+        6: DatasetInfo(
+            number=6,
+            zip_available=True,
+            zip_size_mb=51,
+            magnet=None,
+            magnet_size_gb=None,
+            efta_start=None,
+            efta_end=None,
+        ),
+        7: DatasetInfo(
+            number=7,
+            zip_available=True,
+            zip_size_mb=97,
+            magnet=None,
+            magnet_size_gb=None,
+            efta_start=None,
+            efta_end=None,
+        ),
+        8: DatasetInfo(
+            number=8,
+            zip_available=True,
+            zip_size_mb=10200,
+            magnet=None,
+            magnet_size_gb=None,
+            efta_start=None,
+            efta_end=None,
+        ),
+        9: DatasetInfo(
+            number=9,
+            zip_available=False,  # REMOVED!
+            zip_size_mb=None,
+            magnet="magnet:?xt=urn:btih:0a3d4b84a77bd982c9c2761f40944402b94f9c64",
+            magnet_size_gb=46,  # Partial
+            efta_start=39025,
+            efta_end=1262781,
+        ),
+        10: DatasetInfo(
+            number=10,
+            zip_available=False,  # REMOVED!
+            zip_size_mb=None,
+            magnet="magnet:?xt=urn:btih:d509cc4ca1a415a9ba3b6cb920f67c44aed7fe1f",
+            magnet_size_gb=82,
+            efta_start=1262782,
+            efta_end=2205654,
+            checksum_sha256="7D6935B1C63FF2F6BCABDD024EBC2A770F90C43B0D57B646FA7CBD4C0ABCF846",
+            checksum_md5="B8A72424AE812FD21D225195812B2502",
+        ),
+        11: DatasetInfo(
+            number=11,
+            zip_available=False,  # REMOVED!
+            zip_size_mb=None,
+            magnet=None,  # No verified magnet yet
+            magnet_size_gb=None,
+            efta_start=2205655,
+            efta_end=2730264,
+        ),
+        12: DatasetInfo(
+            number=12,
+            zip_available=True,
+            zip_size_mb=114,
+            magnet="magnet:?xt=urn:btih:8bc781c7259f4b82406cd2175a1d5e9c3b6bfc90",
+            magnet_size_gb=0.114,
+            efta_start=2730265,
+            efta_end=None,
+        ),
+    }
+
+
+def __getattr__(name: str):
+    """Build DATASETS and its partitions on first access rather than at import time.
+
+    ZIP_DATASETS and TORRENT_DATASETS list the dataset numbers with a ZIP
+    download and a magnet link respectively.
+    """
+    if name == "DATASETS":
+        value = _build_datasets()
+    elif name in ("ZIP_DATASETS", "TORRENT_DATASETS"):
+        datasets = globals().get("DATASETS") or __getattr__("DATASETS")
+        if name == "ZIP_DATASETS":
+            value = [num for num, ds in datasets.items() if ds.zip_available]
+        else:
+            value = [num for num, ds in datasets.items() if ds.magnet]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
 
 def get_zip_url(dataset_num: int) -> str:
@@ -174,7 +203,4 @@ def get_magnet_with_trackers(magnet: str) -> str:
     """Add trackers to a magnet link."""
     if not magnet:
         return magnet
-    tracker_params = "&".join(f"tr={t}" for t in TRACKERS)
-    if "?" in magnet:
-        return f"{magnet}&{tracker_params}"
-    return f"{magnet}?{tracker_params}"
+    return f"{magnet}{'&' if '?' in magnet else '?'}{_TRACKER_PARAMS}"
@@ -1,10 +1,17 @@
 """Download functionality using aria2c."""
 
+import asyncio
+import functools
 import os
+import random
 import subprocess
 import shutil
 import socket
+import struct
+import time
+import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 
@@ -12,7 +19,6 @@ from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from .config import (
-    DATASETS,
     DOJ_COOKIE,
     get_zip_url,
     get_magnet_with_trackers,
@@ -21,10 +27,58 @@ from .config import (
 
 console = Console()
 
+# aria2c write caching for direct (HTTP) downloads
+_IO_OPTIONS = [
+    "--disk-cache=64M",
+]
+
+# ZIPs fetched at once by download_all_zips(); they all come from the same
+# DOJ host and each already opens several connections
+MAX_CONCURRENT_ZIPS = 3
+
+# Reserve ZIP space with fallocate(2) instead of writing zeros. aria2c aborts
+# on filesystems without fallocate (exFAT, NTFS-3G, some NFS/FUSE mounts), so
+# this can be turned off with Downloader(falloc=False) / --no-falloc.
+_FALLOC_OPTION = "--file-allocation=falloc"
+
+# aria2c options shared by single and batched ZIP downloads
+_ZIP_OPTIONS = [
+    f"--header=Cookie: {DOJ_COOKIE}",
+    "--max-connection-per-server=8",
+    "--split=8",
+    "--min-split-size=10M",
+    "--continue=true",
+    "--auto-file-renaming=false",
+    "--timeout=120",
+    "--max-tries=10",
+    "--retry-wait=5",
+    "--console-log-level=notice",
+    "--summary-interval=10",
+    *_IO_OPTIONS,
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _aria2c_path() -> Optional[str]:
+    """Return the absolute path of aria2c on PATH (cached per process)."""
+    return shutil.which("aria2c")
+
 
 def check_aria2c() -> bool:
     """Check if aria2c is installed and available."""
-    return shutil.which("aria2c") is not None
+    return _aria2c_path() is not None
+
+
+def _run_aria2c(args: List[str]) -> subprocess.CompletedProcess:
+    """Run an aria2c command line in the foreground.
+
+    With an absolute executable path and close_fds=False, subprocess starts
+    the child with posix_spawn() rather than fork() + exec(), so a large
+    parent process is not duplicated just to exec aria2c. Descriptors opened
+    by Python are non-inheritable, so nothing extra leaks into the child.
+    """
+    executable = _aria2c_path() or args[0]
+    return subprocess.run([executable, *args[1:]], close_fds=False, check=False)
 
 
 def get_aria2c_install_instructions() -> str:
@@ -40,6 +94,83 @@ Linux (yum):       sudo yum install aria2
 """
 
 
+def _file_size(path: Path) -> Optional[int]:
+    """Return the size of a file, or None if it does not exist."""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return None
+
+
+def _download_complete(path: Path) -> bool:
+    """Return True if path exists and aria2c has no unfinished control file for it."""
+    control_file = path.with_name(path.name + ".aria2")
+    return path.exists() and not control_file.exists()
+
+
+def _probe_http_tracker(tracker: str, timeout: float = 5) -> float:
+    """Return the response time of an HTTP tracker announce URL."""
+    start = time.time()
+    req = urllib.request.Request(tracker, method="GET")
+    with urllib.request.urlopen(req, timeout=timeout):
+        return time.time() - start
+
+
+def _probe_udp_tracker(tracker: str, timeout: float = 5) -> float:
+    """Return the response time of a UDP tracker to a BEP 15 connect request."""
+    parts = urllib.parse.urlsplit(tracker)
+    family, _, _, _, address = socket.getaddrinfo(
+        parts.hostname, parts.port, type=socket.SOCK_DGRAM
+    )[0]
+    transaction_id = random.getrandbits(32)
+    request = struct.pack(">QII", 0x41727101980, 0, transaction_id)
+
+    start = time.time()
+    with socket.socket(family, socket.SOCK_DGRAM) as s:
+        s.settimeout(timeout)
+        s.sendto(request, address)
+        response = s.recv(16)
+    elapsed = time.time() - start
+
+    if len(response) < 16 or struct.unpack(">II", response[:8]) != (0, transaction_id):
+        raise ValueError("unexpected connect response")
+    return elapsed
+
+
+def _probe_tracker(tracker: str) -> tuple:
+    """Probe a tracker, returning (reachable, response_time, error)."""
+    if tracker.startswith("http://"):
+        probe = _probe_http_tracker
+    elif tracker.startswith("udp://"):
+        probe = _probe_udp_tracker
+    else:
+        return False, None, "Unknown protocol"
+    try:
+        return True, probe(tracker), None
+    except Exception as e:
+        return False, None, str(e)
+
+
+async def _port_in_use(port: int, timeout: float = 1) -> bool:
+    """Return True if something accepts TCP connections on a local port."""
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection("127.0.0.1", port), timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    await writer.wait_closed()
+    return True
+
+
+async def _check_ports(ports: List[int]) -> list:
+    """Check all local ports concurrently."""
+    return await asyncio.gather(
+        *(_port_in_use(port) for port in ports), return_exceptions=True
+    )
+
+
 def diagnose_torrent_connectivity() -> dict:
     """Diagnose torrent connectivity issues."""
     console.print("\n[bold cyan]=== TORRENT CONNECTIVITY DIAGNOSTICS ===[/bold cyan]\n")
@@ -66,52 +197,38 @@ def diagnose_torrent_connectivity() -> dict:
     # Check DHT cache
     dht_cache_path = Path.home() / ".cache" / "aria2" / "dht.dat"
     results["dht_cache"]["path"] = str(dht_cache_path)
-    if dht_cache_path.exists():
+    dht_cache_size = _file_size(dht_cache_path)
+    if dht_cache_size is not None:
         results["dht_cache"]["exists"] = True
-        results["dht_cache"]["size"] = dht_cache_path.stat().st_size
-        console.print(f"[green]✓[/green] DHT cache exists: {dht_cache_path} ({dht_cache_path.stat().st_size} bytes)")
+        results["dht_cache"]["size"] = dht_cache_size
+        console.print(f"[green]✓[/green] DHT cache exists: {dht_cache_path} ({dht_cache_size} bytes)")
     else:
         console.print(f"[yellow]⚠[/yellow] DHT cache NOT found: {dht_cache_path}")
         console.print("    [dim]This may cause DHT initialization errors[/dim]")
 
     # Test trackers
     console.print("\n[bold]Testing Trackers:[/bold]")
-    for tracker in TRACKERS:
-        tracker_name = tracker.split("://")[1].split(":")[0]
-        results["trackers"][tracker_name] = {"reachable": False, "response_time": None}
-
-        if tracker.startswith("http://"):
-            try:
-                import time
-                start = time.time()
-                req = urllib.request.Request(tracker, method="GET")
-                with urllib.request.urlopen(req, timeout=5) as response:
-                    elapsed = time.time() - start
-                    results["trackers"][tracker_name]["reachable"] = True
-                    results["trackers"][tracker_name]["response_time"] = elapsed
-                    console.print(f"  [green]✓[/green] {tracker_name} - {elapsed:.2f}s")
-            except Exception as e:
-                console.print(f"  [red]✗[/red] {tracker_name} - Error: {str(e)[:50]}")
-        elif tracker.startswith("udp://"):
-            # UDP trackers cannot be easily tested with HTTP
-            console.print(f"  [dim]?[/dim] {tracker_name} - UDP (cannot test with HTTP)")
-        else:
-            console.print(f"  [dim]?[/dim] {tracker_name} - Unknown protocol")
+    # Probe all trackers at once so the wait is the slowest tracker, not the sum
+    with ThreadPoolExecutor(max_workers=len(TRACKERS)) as pool:
+        probes = pool.map(_probe_tracker, TRACKERS)
+        for tracker, (reachable, elapsed, error) in zip(TRACKERS, probes):
+            tracker_name = tracker.split("://")[1].split(":")[0]
+            results["trackers"][tracker_name] = {"reachable": reachable, "response_time": elapsed}
+            if reachable:
+                console.print(f"  [green]✓[/green] {tracker_name} - {elapsed:.2f}s")
+            else:
+                console.print(f"  [red]✗[/red] {tracker_name} - Error: {error[:50]}")
 
     # Check network ports
     console.print("\n[bold]Network Port Check:[/bold]")
     ports_to_check = [6918, 6971]  # Default aria2 ports
-    for port in ports_to_check:
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(1)
-                result = s.connect_ex(("127.0.0.1", port))
-                if result == 0:
-                    console.print(f"  [green]✓[/green] Port {port} is in use (aria2 may be running)")
-                else:
-                    console.print(f"  [dim]✓[/dim] Port {port} is available")
-        except Exception as e:
-            console.print(f"  [red]✗[/red] Port {port} - Error: {e}")
+    for port, in_use in zip(ports_to_check, asyncio.run(_check_ports(ports_to_check))):
+        if isinstance(in_use, Exception):
+            console.print(f"  [red]✗[/red] Port {port} - Error: {in_use}")
+        elif in_use:
+            console.print(f"  [green]✓[/green] Port {port} is in use (aria2 may be running)")
+        else:
+            console.print(f"  [dim]✓[/dim] Port {port} is available")
 
     return results
 
@@ -119,9 +236,10 @@ def diagnose_torrent_connectivity() -> dict:
 class Downloader:
     """Handles all download operations."""
 
-    def __init__(self, output_dir: Path, concurrent: int = 5):
+    def __init__(self, output_dir: Path, concurrent: int = 5, falloc: bool = True):
         self.output_dir = Path(output_dir)
         self.concurrent = concurrent
+        self.zip_options = [*_ZIP_OPTIONS, _FALLOC_OPTION] if falloc else _ZIP_OPTIONS
         self.torrents_dir = self.output_dir / "torrents"
         self.zips_dir = self.output_dir / "zips"
 
@@ -145,23 +263,18 @@ class Downloader:
 
         # DIAGNOSTIC: Check DHT cache file
         dht_cache_path = Path.home() / ".cache" / "aria2" / "dht.dat"
-        if dht_cache_path.exists():
+        dht_cache_size = _file_size(dht_cache_path)
+        if dht_cache_size is not None:
             console.print(f"[dim]DEBUG: DHT cache exists: {dht_cache_path}[/dim]")
-            console.print(f"[dim]DEBUG: DHT cache size: {dht_cache_path.stat().st_size} bytes[/dim]")
+            console.print(f"[dim]DEBUG: DHT cache size: {dht_cache_size} bytes[/dim]")
             # FIX: Detect and remove corrupted DHT cache (empty or too small)
-            if dht_cache_path.stat().st_size < 100:
+            if dht_cache_size < 100:
                 console.print(f"[yellow]DHT cache appears corrupted (too small), removing...[/yellow]")
                 dht_cache_path.unlink()
         else:
             console.print(f"[dim]DEBUG: DHT cache does NOT exist: {dht_cache_path}[/dim]")
             console.print(f"[dim]DEBUG: This may cause DHT initialization error[/dim]")
 
-        # DIAGNOSTIC: Check if output directory exists
-        if self.torrents_dir.exists():
-            console.print(f"[dim]DEBUG: Output directory exists[/dim]")
-        else:
-            console.print(f"[dim]DEBUG: Output directory does NOT exist, will be created[/dim]")
-
         # FIX: Ensure aria2 cache directory exists for DHT
         aria2_cache = Path.home() / ".cache" / "aria2"
         aria2_cache.mkdir(parents=True, exist_ok=True)
@@ -200,7 +313,7 @@ class Downloader:
 
         try:
             # Run in foreground so user can see progress
-            result = subprocess.run(args, check=False)
+            result = _run_aria2c(args)
             console.print(f"[dim]DEBUG: aria2c return code: {result.returncode}[/dim]")
             return result.returncode == 0
         except Exception as e:
@@ -213,6 +326,8 @@ class Downloader:
             console.print(get_aria2c_install_instructions(), style="red")
             return False
 
+        from .config import DATASETS
+
         dataset = DATASETS.get(dataset_num)
         if not dataset or not dataset.zip_available:
             console.print(f"[red]Dataset {dataset_num} ZIP not available[/red]")
@@ -222,7 +337,7 @@ class Downloader:
         filename = f"DataSet{dataset_num}.zip"
         output_path = self.zips_dir / filename
 
-        if output_path.exists():
+        if _download_complete(output_path):
             console.print(f"[dim]SKIP: {filename} already exists[/dim]")
             return True
 
@@ -235,44 +350,77 @@ class Downloader:
             url,
             f"--dir={self.zips_dir}",
             f"--out={filename}",
-            f"--header=Cookie: {DOJ_COOKIE}",
-            "--max-connection-per-server=8",
-            "--split=8",
-            "--min-split-size=10M",
-            "--continue=true",
-            "--auto-file-renaming=false",
-            "--timeout=120",
-            "--max-tries=10",
-            "--retry-wait=5",
-            "--console-log-level=notice",
-            "--summary-interval=10",
+            *self.zip_options,
         ]
 
         try:
-            result = subprocess.run(args, check=False)
+            result = _run_aria2c(args)
             return result.returncode == 0
         except Exception as e:
             console.print(f"[red]Error downloading ZIP: {e}[/red]")
             return False
 
     def download_all_zips(self) -> dict:
-        """Download all available ZIP files."""
+        """Download all available ZIP files in a single aria2c session."""
+        if not check_aria2c():
+            console.print(get_aria2c_install_instructions(), style="red")
+            return {}
+
+        from .config import DATASETS, ZIP_DATASETS
+
         results = {}
-        for num, dataset in DATASETS.items():
-            if dataset.zip_available:
-                console.print(f"\n[bold]Dataset {num}[/bold]")
-                results[num] = self.download_zip(num)
+        pending = []
+        for num in ZIP_DATASETS:
+            filename = f"DataSet{num}.zip"
+            if _download_complete(self.zips_dir / filename):
+                console.print(f"[dim]SKIP: {filename} already exists[/dim]")
+                results[num] = True
+            else:
+                pending.append(num)
+
+        if not pending:
+            return results
+
+        # Create URL list file for aria2c
+        url_list_file = self.output_dir / "zip-urls-temp.txt"
+        url_list_file.write_text("".join(
+            f"{get_zip_url(num)}\n  out=DataSet{num}.zip\n" for num in pending
+        ))
+
+        for num in pending:
+            size_mb = DATASETS[num].zip_size_mb
+            size = f" (~{size_mb} MB)" if size_mb else ""
+            console.print(f"[yellow]Downloading: DataSet{num}.zip{size}[/yellow]")
+
+        args = [
+            "aria2c",
+            f"--input-file={url_list_file}",
+            f"--dir={self.zips_dir}",
+            f"--max-concurrent-downloads={min(self.concurrent, MAX_CONCURRENT_ZIPS)}",
+            *self.zip_options,
+        ]
+
+        try:
+            _run_aria2c(args)
+        except Exception as e:
+            console.print(f"[red]Error downloading ZIPs: {e}[/red]")
+        finally:
+            url_list_file.unlink(missing_ok=True)
+
+        for num in pending:
+            results[num] = _download_complete(self.zips_dir / f"DataSet{num}.zip")
         return results
 
     def download_all_torrents(self) -> dict:
         """Download all available torrents."""
+        from .config import DATASETS, TORRENT_DATASETS
+
         results = {}
-        for num, dataset in DATASETS.items():
-            if dataset.magnet:
-                console.print(f"\n[bold]Dataset {num} (Torrent)[/bold]")
-                results[num] = self.download_torrent(
-                    dataset.magnet, f"DataSet{num}"
-                )
+        for num in TORRENT_DATASETS:
+            console.print(f"\n[bold]Dataset {num} (Torrent)[/bold]")
+            results[num] = self.download_torrent(
+                DATASETS[num].magnet, f"DataSet{num}"
+            )
         return results
 
     def download_pdf_list(self, urls: List[str], output_dir: Path) -> bool:
@@ -289,12 +437,10 @@ class Downloader:
 
         # Create URL list file for aria2c
         url_list_file = self.output_dir / "pdf-urls-temp.txt"
-        with open(url_list_file, "w") as f:
-            for url in urls:
-                filename = url.split("/")[-1]
-                f.write(f"{url}\n")
-                f.write(f"  dir={output_dir}\n")
-                f.write(f"  out={filename}\n")
+        url_list_file.write_text("".join(
+            f"{url}\n  dir={output_dir}\n  out={url.rsplit('/', 1)[-1]}\n"
+            for url in urls
+        ))
 
         console.print(f"[yellow]Downloading {len(urls)} PDFs...[/yellow]")
 
@@ -311,10 +457,11 @@ class Downloader:
             "--retry-wait=3",
             "--console-log-level=notice",
             "--summary-interval=30",
+            *_IO_OPTIONS,
         ]
 
         try:
-            result = subprocess.run(args, check=False)
+            result = _run_aria2c(args)
             # Clean up temp file
             url_list_file.unlink(missing_ok=True)
             return result.returncode == 0
@@ -1,5 +1,6 @@
 """Scraper for enumerating PDF files from DOJ listing pages."""
 
+import os
 import re
 import time
 import json
@@ -23,6 +24,7 @@ class DatasetScraper:
         self.output_dir = Path(output_dir)
         self.dataset_num = dataset_num
         self.index_file = self.output_dir / f"dataset{dataset_num}-index.json"
+        self.stats_file = self.output_dir / f"dataset{dataset_num}-index.stats.json"
         self.urls_file = self.output_dir / f"dataset{dataset_num}-urls.txt"
         self.session = requests.Session()
         self.session.headers.update({
@@ -38,11 +40,20 @@ class DatasetScraper:
         return {"files": {}, "last_page": 0, "complete": False}
 
     def save_index(self, index: dict) -> None:
-        """Save index to file."""
+        """Save index and its summary stats to file."""
         self.output_dir.mkdir(parents=True, exist_ok=True)
         with open(self.index_file, "w") as f:
             json.dump(index, f, indent=2)
 
+        # Small summary so `status` doesn't have to parse the full index
+        stats = {
+            "file_count": len(index["files"]),
+            "last_page": index["last_page"],
+            "complete": index["complete"],
+        }
+        with open(self.stats_file, "w") as f:
+            json.dump(stats, f)
+
     def extract_pdf_links(self, html: str) -> List[str]:
         """Extract PDF URLs from HTML content."""
         pattern = rf'href="(/epstein/files/DataSet%20{self.dataset_num}/[^"]+\.pdf)"'
@@ -188,7 +199,8 @@ class DatasetScraper:
         if not pdf_dir.exists():
             return list(index["files"].values())
 
-        downloaded = {f.name for f in pdf_dir.glob("*.pdf")}
+        with os.scandir(pdf_dir) as it:
+            downloaded = {e.name for e in it if e.name.endswith(".pdf")}
         missing = []
 
         for filename, url in index["files"].items():